@@ -9,9 +9,103 @@
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    # Numba is optional; without it the per-school statistics use vectorized NumPy reductions
+    _HAS_NUMBA = False
+
 # Global variable to store the data
 enrollment_data = None
 
+# Grade columns of the data, in the order of the last axis of the enrollment array
+GRADE_COLUMNS = ['Grade 10', 'Grade 11', 'Grade 12']
+
+
+def _school_kernel_loop(school_data):
+    """
+    Compute the enrollment statistics for a single school in one pass over its data.
+    Written as explicit loops to be compiled by Numba.
+
+    Parameters:
+        school_data (np.ndarray): 2D array of enrollments, one row per year and one column per grade.
+
+    Returns:
+        tuple: Per-grade sums, yearly totals, total enrollment, highest enrollment, lowest enrollment,
+        the enrollments over 500 and their median (-1 if there are none).
+    """
+    num_years, num_grades = school_data.shape
+    grade_sums = np.zeros(num_grades, dtype=np.int64)
+    yearly_totals = np.zeros(num_years, dtype=np.int64)
+    over_500 = np.empty(num_years * num_grades, dtype=np.int64)
+    total = 0
+    count = 0
+    highest = school_data[0, 0]
+    lowest = school_data[0, 0]
+
+    for i in range(num_years):
+        for j in range(num_grades):
+            value = school_data[i, j]
+            grade_sums[j] += value
+            yearly_totals[i] += value
+            total += value
+            if value > highest:
+                highest = value
+            if value < lowest:
+                lowest = value
+            if value > 500:
+                over_500[count] = value
+                count += 1
+
+    # Partial selection places the middle value of the enrollments over 500;
+    # for an even count the lower middle value is the largest one left of it
+    over_500 = over_500[:count]
+    median = -1
+    if count > 0:
+        middle = count // 2
+        partitioned = np.partition(over_500, middle)
+        if count % 2:
+            median = partitioned[middle]
+        else:
+            median = (partitioned[:middle].max() + partitioned[middle]) // 2
+
+    return grade_sums, yearly_totals, total, highest, lowest, over_500, median
+
+
+def _school_kernel_numpy(school_data):
+    """
+    Compute the enrollment statistics for a single school with vectorized NumPy reductions.
+    Used in place of the compiled loop when Numba is not installed.
+
+    Parameters:
+        school_data (np.ndarray): 2D array of enrollments, one row per year and one column per grade.
+
+    Returns:
+        tuple: Per-grade sums, yearly totals, total enrollment, highest enrollment, lowest enrollment,
+        the enrollments over 500 and their median (-1 if there are none).
+    """
+    grade_sums = school_data.sum(axis=0, dtype=np.int64)
+    yearly_totals = school_data.sum(axis=1, dtype=np.int64)
+    flat_data = school_data.ravel()
+    over_500 = flat_data[flat_data > 500].astype(np.int64)
+
+    # Same partial selection as the loop version
+    median = -1
+    if over_500.size > 0:
+        middle = over_500.size // 2
+        partitioned = np.partition(over_500, middle)
+        if over_500.size % 2:
+            median = partitioned[middle]
+        else:
+            median = (partitioned[:middle].max() + partitioned[middle]) // 2
+
+    return grade_sums, yearly_totals, grade_sums.sum(), flat_data.max(), flat_data.min(), over_500, median
+
+
+# Compile the single-pass loop when Numba is available; plain Python loops would be slower than NumPy
+_school_kernel = njit(cache=True)(_school_kernel_loop) if _HAS_NUMBA else _school_kernel_numpy
+
 
 class SchoolStats:
     """
@@ -20,7 +114,14 @@ class SchoolStats:
     Attributes:
         data (pd.DataFrame): The dataframe holding school enrollment data.
         enrollment_array (np.ndarray): 3D NumPy array for enrollment data.
+        _general_stats (dict): General statistics for all schools, computed on first use.
+        _school_positions (np.ndarray): Array index of each row's school.
+        _years_col (np.ndarray): School year of each row of the data.
+        _grade_block (np.ndarray): Contiguous 2D array of Grade 10-12 enrollments for each row, NaN where missing.
         school_codes (dict): Dictionary mapping school names to their codes.
+        _school_names (list): School names in array order, which is their order of first appearance.
+        _name_to_index (dict): Dictionary mapping school names to their array index.
+        _code_to_name (dict): Dictionary mapping school codes to their names.
     """
     def __init__(self, data):
         """
@@ -31,27 +132,81 @@ class SchoolStats:
         """
         self.data = data
         self.enrollment_array = None
-        self.school_codes = {name: code for name, code in zip(data['School Name'], data['School Code'])}
+        self._general_stats = None
+        # Collapse to one row per school before building the dictionary
+        pairs = data[['School Name', 'School Code']].drop_duplicates()
+        self.school_codes = dict(pairs.itertuples(index=False, name=None))
+
+        # Code the schools by first appearance; the codes give each row's school index in the array
+        self._school_positions, school_names = pd.factorize(data['School Name'])
+        self._school_names = list(school_names)
+
+        # Lookup tables built once so each query is a constant-time dictionary access
+        self._name_to_index = {name: i for i, name in enumerate(self._school_names)}
+        self._code_to_name = {code: name for name, code in self.school_codes.items()}
+
+        # Pull the columns used by the statistics out of pandas once
+        self._years_col = data['School Year'].to_numpy()
+        self._grade_block = np.ascontiguousarray(
+            data[GRADE_COLUMNS].to_numpy(dtype=np.float32, na_value=np.nan)
+        )
 
     def create_enrollment_array(self):
         """
         Create a 3-dimensional array from the provided data.
+        
+        Raises:
+            ValueError: If the data does not have exactly one row for each school and year,
+                or an enrollment does not fit in the array's int16 type.
         """
-        schools = self.data['School Name'].unique()
-        years = self.data['School Year'].unique()
-        grades = ['Grade 10', 'Grade 11', 'Grade 12']
+        years = np.unique(self._years_col)
+        num_schools = len(self._school_names)
+        num_years = len(years)
+        num_grades = self._grade_block.shape[1]
+
+        if len(self._school_positions) != num_schools * num_years:
+            raise ValueError("Every school must have exactly one row for each school year.")
+
+        # Sort the rows once by school, then year, so a reshape lays them out on the (school, year) grid
+        order = np.lexsort((self._years_col, self._school_positions))
+
+        # The reshape is only valid if every school's run of rows covers each year exactly once
+        grid_schools = self._school_positions[order].reshape(num_schools, num_years)
+        grid_years = self._years_col[order].reshape(num_schools, num_years)
+        if not ((grid_schools == np.arange(num_schools)[:, np.newaxis]).all() and (grid_years == years).all()):
+            raise ValueError("Every school must have exactly one row for each school year.")
+
+        rows = self._grade_block[order]
 
-        self.enrollment_array = np.empty((len(schools), len(years), len(grades)), dtype=int)
+        # Enrollments are stored as int16, so reject any that would not fit rather than let them wrap
+        int16_limit = np.iinfo(np.int16).max
+        if np.any(np.abs(rows) > int16_limit):
+            raise ValueError(f"Enrollments must be between -{int16_limit} and {int16_limit}.")
 
-        for i, school in enumerate(schools):
-            for j, year in enumerate(years):
-                for k, grade in enumerate(grades):
-                    value = self.data[(self.data['School Name'] == school) & (self.data['School Year'] == year)][grade]
-                    self.enrollment_array[i, j, k] = int(value) if not pd.isna(value).any() else 0
+        # Missing enrollments are zeroed in place on the reordered copy; keep the array C-contiguous
+        # so each school's block is one contiguous run of memory, and use int16 since sums accumulate in int64
+        shape = (num_schools, num_years, num_grades)
+        self.enrollment_array = np.ascontiguousarray(np.nan_to_num(rows, copy=False, nan=0.0).reshape(shape), dtype=np.int16)
 
         print(f"Shape of the full Data Array: {self.enrollment_array.shape}")
         print(f"Dimensions of the full Data Array: {self.enrollment_array.ndim}")
 
+    def _floored_mean(self, mask):
+        """
+        Compute the floored mean of the reported enrollments selected by a mask.
+        
+        Parameters:
+            mask (np.ndarray): Boolean array, shaped like the grade block, selecting the enrollments to average.
+        
+        Returns:
+            int or float: The floored mean, or NaN if the mask selects no enrollments.
+        """
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return np.nan
+
+        return int(self._grade_block.sum(where=mask, dtype=np.float64)) // count
+
     def get_school_index(self, identifier):
         """
         Get the index of the school in the array.
@@ -65,15 +220,16 @@ class SchoolStats:
         Raises:
             ValueError: If the school name or code is invalid.
         """
-        if isinstance(identifier, int):
-            school_name = next((name for name, code in self.school_codes.items() if code == identifier), None)
+        if isinstance(identifier, (int, np.integer)):
+            school_name = self._code_to_name.get(identifier)
         else:
             school_name = identifier
 
-        if school_name not in self.school_codes:
+        index = self._name_to_index.get(school_name)
+        if index is None:
             raise ValueError("You must enter a valid school name or code.")
 
-        return list(self.school_codes.keys()).index(school_name)
+        return index
 
     def calculate_school_stats(self, identifier):
         """
@@ -86,48 +242,104 @@ class SchoolStats:
             dict: A dictionary containing the school-specific statistics.
         """
         index = self.get_school_index(identifier)
-        school_name = list(self.school_codes.keys())[index]
+        school_name = self._school_names[index]
         school_code = self.school_codes[school_name]
 
+        # The school's block is a contiguous view of the array, so the kernel reads it without a copy
         school_data = self.enrollment_array[index, :, :]
 
+        grade_sums, yearly_totals, total, highest, lowest, over_500, median = _school_kernel(school_data)
+        num_years = school_data.shape[0]
+
         stats = {
             "school_name": school_name,
             "school_code": school_code,
-            "mean_grade_10": np.floor(np.mean(school_data[:, 0])),
-            "mean_grade_11": np.floor(np.mean(school_data[:, 1])),
-            "mean_grade_12": np.floor(np.mean(school_data[:, 2])),
-            "highest_enrollment": np.max(school_data),
-            "lowest_enrollment": np.min(school_data),
-            "yearly_totals": np.sum(school_data, axis=1),
-            "total_enrollment": np.sum(school_data),
-            "mean_yearly_enrollment": np.floor(np.mean(np.sum(school_data, axis=1))),
-            "enrollments_over_500": school_data[school_data > 500]
+            "mean_grade_10": int(grade_sums[0]) // num_years,
+            "mean_grade_11": int(grade_sums[1]) // num_years,
+            "mean_grade_12": int(grade_sums[2]) // num_years,
+            "highest_enrollment": int(highest),
+            "lowest_enrollment": int(lowest),
+            "yearly_totals": yearly_totals,
+            "total_enrollment": int(total),
+            "mean_yearly_enrollment": int(total) // num_years,
+            "enrollments_over_500": over_500
         }
 
-        if len(stats["enrollments_over_500"]) > 0:
-            stats["median_over_500"] = int(np.median(stats["enrollments_over_500"]))
+        if over_500.size > 0:
+            stats["median_over_500"] = int(median)
         else:
             stats["median_over_500"] = "No enrollments over 500"
 
         return stats
 
+    def calculate_all_schools_stats(self):
+        """
+        Calculate the school-specific statistics for every school at once using reductions over the full array.
+        
+        Returns:
+            pd.DataFrame: One row per school with the same statistics as calculate_school_stats, except the
+            yearly totals and the individual enrollments over 500. Schools with no enrollments over 500
+            have a missing median.
+        """
+        num_schools, num_years = self.enrollment_array.shape[:2]
+        flat_data = self.enrollment_array.reshape(num_schools, -1)
+
+        # Each school's total is the sum of its per-grade sums
+        grade_sums = self.enrollment_array.sum(axis=1, dtype=np.int64)
+        totals = grade_sums.sum(axis=1)
+
+        # After sorting each school's row, its enrollments over 500 are the last `counts` entries;
+        # the positions are clipped for schools with none, whose median is masked out below
+        sorted_data = np.sort(flat_data, axis=1)
+        counts = np.count_nonzero(flat_data > 500, axis=1)
+        start = flat_data.shape[1] - counts
+        last = flat_data.shape[1] - 1
+        rows = np.arange(num_schools)
+        lower = sorted_data[rows, np.minimum(start + (counts - 1) // 2, last)].astype(np.int64)
+        upper = sorted_data[rows, np.minimum(start + counts // 2, last)].astype(np.int64)
+        medians = pd.array((lower + upper) // 2, dtype="Int64")
+        medians[counts == 0] = pd.NA
+
+        return pd.DataFrame({
+            "school_name": self._school_names,
+            "school_code": [self.school_codes[name] for name in self._school_names],
+            "mean_grade_10": grade_sums[:, 0] // num_years,
+            "mean_grade_11": grade_sums[:, 1] // num_years,
+            "mean_grade_12": grade_sums[:, 2] // num_years,
+            "highest_enrollment": sorted_data[:, -1].astype(np.int64),
+            "lowest_enrollment": sorted_data[:, 0].astype(np.int64),
+            "total_enrollment": totals,
+            "mean_yearly_enrollment": totals // num_years,
+            "median_over_500": medians
+        })
+
     def calculate_general_stats(self):
         """
-        Calculate general statistics for all schools.
+        Get the general statistics for all schools. They do not depend on the requested school, so they
+        are computed from the data kept by __init__ on the first call and cached; the enrollment array
+        does not need to be created first.
         
         Returns:
             dict: A dictionary containing the general statistics.
         """
-        stats = {
-            "mean_2013": np.floor(np.mean(self.data[self.data['School Year'] == 2013][['Grade 10', 'Grade 11', 'Grade 12']])),
-            "mean_2022": np.floor(np.mean(self.data[self.data['School Year'] == 2022][['Grade 10', 'Grade 11', 'Grade 12']])),
-            "total_graduating_2022": np.sum(self.data[self.data['School Year'] == 2022]['Grade 12']),
-            "highest_enrollment": np.max(self.enrollment_array),
-            "lowest_enrollment": np.min(self.enrollment_array)
-        }
+        if self._general_stats is None:
+            # Each year is selected by a mask of its reported enrollments, which the reductions apply directly
+            reported = ~np.isnan(self._grade_block)
+            in_2013 = reported & (self._years_col == 2013)[:, np.newaxis]
+            in_2022 = reported & (self._years_col == 2022)[:, np.newaxis]
 
-        return stats
+            # Missing enrollments count as zero for the highest and lowest, matching the enrollment array
+            filled = np.where(reported, self._grade_block, 0)
+
+            self._general_stats = {
+                "mean_2013": self._floored_mean(in_2013),
+                "mean_2022": self._floored_mean(in_2022),
+                "total_graduating_2022": int(self._grade_block[:, 2].sum(where=in_2022[:, 2], dtype=np.float64)),
+                "highest_enrollment": int(filled.max()),
+                "lowest_enrollment": int(filled.min())
+            }
+
+        return dict(self._general_stats)
 
 
 def load_data(filename):
@@ -144,7 +356,17 @@ def load_data(filename):
         ValueError: If the CSV file cannot be loaded.
     """
     try:
-        data = pd.read_csv(filename)
+        # Only parse the columns the application uses, with their types given up front
+        data = pd.read_csv(
+            filename,
+            usecols=['School Name', 'School Code', 'School Year'] + GRADE_COLUMNS,
+            dtype={
+                'School Name': 'category',
+                'School Code': np.int32,
+                'School Year': np.int16,
+                **{grade: 'Int32' for grade in GRADE_COLUMNS}
+            }
+        )
         return data
     except Exception as e:
         raise ValueError(f"Error reading {filename}: {e}")